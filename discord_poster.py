@@ -1,28 +1,160 @@
 """Discord webhook poster module."""
+import json
+import math
+import time
+import threading
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Dict, Optional
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:  # optional: pip install orjson
+    orjson = None
+
+# Emoji used in embed fields
+_ARROW_UP = "\u2B06\uFE0F"  # ⬆️
+_SPEECH = "\U0001F4AC"  # 💬
+_SEARCH = "\U0001F50D"  # 🔍
+_WARNING = "\u26A0\uFE0F"  # ⚠️
+
+
+def _encode_payload(payload: Dict) -> bytes:
+    """Serialize a webhook payload to JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode('utf-8')
+
+
+def _header_number(response: requests.Response, name: str) -> Optional[float]:
+    """Parse a numeric rate-limit header.
+
+    Returns:
+        The value, or None if the header is missing or not a finite number
+    """
+    try:
+        value = float(response.headers[name])
+    except (KeyError, ValueError):
+        return None
+    return value if math.isfinite(value) else None
 
 
 class DiscordPoster:
     """Post messages to Discord via webhook."""
 
+    # How often a post answered with 429 is retried before giving up on it
+    MAX_429_RETRIES = 3
+
     def __init__(self, webhook_url: str):
         """Initialize Discord poster.
 
+        Use one poster per webhook URL: the rate-limit bucket it tracks belongs
+        to the webhook, and the poster can be shared by several threads.
+
         Args:
             webhook_url: Discord webhook URL
         """
         self.webhook_url = webhook_url
 
-    def post_message(self, message: Dict, channel_name: str = "Reddit") -> bool:
-        """Post a Reddit post to Discord.
+        # One keep-alive session per poster so consecutive posts reuse the
+        # TCP+TLS connection to Discord instead of handshaking every time.
+        self._session = requests.Session()
+        self._session.headers.update({
+            "Content-Type": "application/json",
+            "User-Agent": "subwatch/1.0",
+        })
+        # Only failed connections are retried: a webhook POST is not
+        # idempotent, and after a read timeout or a 5xx Discord may already
+        # have created the message, so retrying those could post it twice.
+        self._session.mount("https://", HTTPAdapter(
+            pool_connections=2,
+            pool_maxsize=8,
+            max_retries=Retry(total=3, read=0, status=0, backoff_factor=0.5),
+        ))
+
+        # Last rate-limit bucket state reported by Discord for this webhook.
+        # Sends hold the lock so concurrent callers take turns and each one
+        # sees the bucket state left by the previous post.
+        self._bucket_remaining = None
+        self._bucket_reset_at = 0.0
+        self._lock = threading.Lock()
+
+    def _update_bucket(self, response: requests.Response):
+        """Record the rate-limit bucket state reported on a webhook response.
+
+        Responses with missing or malformed headers leave the state as it was.
+        """
+        remaining = _header_number(response, 'X-RateLimit-Remaining')
+        if remaining is None:
+            return
+        reset_after = 0.0
+        if 'X-RateLimit-Reset-After' in response.headers:
+            reset_after = _header_number(response, 'X-RateLimit-Reset-After')
+            if reset_after is None:
+                return
+        self._bucket_remaining = int(remaining)
+        self._bucket_reset_at = time.monotonic() + reset_after
+
+    def _wait_for_bucket(self):
+        """Sleep until the bucket resets, but only if Discord said it is empty."""
+        if self._bucket_remaining == 0:
+            delay = self._bucket_reset_at - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+    def _post(self, body: bytes) -> requests.Response:
+        """POST an encoded payload to the webhook and record its bucket state."""
+        response = self._session.post(self.webhook_url, data=body, timeout=10)
+        self._update_bucket(response)
+        return response
+
+    def _send(self, payload: Dict, error_prefix: str) -> bool:
+        """Deliver one webhook payload, respecting Discord's rate limits.
+
+        Instead of sleeping a fixed amount after every message, we only wait
+        when the last response said the bucket is exhausted. If Discord
+        answers 429 anyway, the post is retried after the advertised
+        Retry-After delay, up to MAX_429_RETRIES times.
+
+        Args:
+            payload: Webhook JSON payload
+            error_prefix: Prefix for the error message printed on failure
+
+        Returns:
+            True if successful, False otherwise
+        """
+        body = _encode_payload(payload)
+        try:
+            with self._lock:
+                self._wait_for_bucket()
+                response = self._post(body)
+                # Bounded: the lock is held meanwhile, so every subreddit
+                # sharing this webhook waits for the retries to end
+                for _ in range(self.MAX_429_RETRIES):
+                    if response.status_code != 429:
+                        break
+                    # Without a usable delay, leave it as a failed post
+                    retry_after = _header_number(response, 'Retry-After')
+                    if retry_after is None:
+                        break
+                    time.sleep(max(retry_after, 0))
+                    response = self._post(body)
+            response.raise_for_status()
+            return True
+        except requests.exceptions.RequestException as e:
+            print(f"{error_prefix}: {e}")
+            return False
+
+    def _build_post_payload(self, message: Dict, channel_name: str) -> Dict:
+        """Build the webhook payload for a Reddit post.
 
         Args:
             message: Post dictionary with Reddit post information
             channel_name: Name of the subreddit for display
 
         Returns:
-            True if successful, False otherwise
+            Webhook JSON payload
         """
         # Extract post information
         title = message.get('title', 'Untitled')
@@ -71,12 +203,12 @@ class DiscordPoster:
                 },
                 {
                     "name": "Score",
-                    "value": f"\u2B06\uFE0F {score}",
+                    "value": f"{_ARROW_UP} {score}",
                     "inline": True
                 },
                 {
                     "name": "Comments",
-                    "value": f"\U0001F4AC {num_comments}",
+                    "value": f"{_SPEECH} {num_comments}",
                     "inline": True
                 }
             ],
@@ -101,26 +233,34 @@ class DiscordPoster:
             warnings.append("Spoiler")
         if warnings:
             embed["fields"].append({
-                "name": "⚠️ Warnings",
+                "name": f"{_WARNING} Warnings",
                 "value": " | ".join(warnings),
                 "inline": False
             })
 
-        payload = {
+        return {
             "embeds": [embed]
         }
 
-        try:
-            response = requests.post(self.webhook_url, json=payload, timeout=10)
-            response.raise_for_status()
-            return True
-        except requests.exceptions.RequestException as e:
-            print(f"Error posting to Discord: {e}")
-            return False
+    def post_message(self, message: Dict, channel_name: str = "Reddit") -> bool:
+        """Post a Reddit post to Discord.
+
+        Args:
+            message: Post dictionary with Reddit post information
+            channel_name: Name of the subreddit for display
+
+        Returns:
+            True if successful, False otherwise
+        """
+        return self._send(self._build_post_payload(message, channel_name),
+                          "Error posting to Discord")
 
     def post_batch(self, messages: list, channel_name: str = "Reddit") -> int:
         """Post multiple Reddit posts to Discord.
 
+        Payloads are built up front and delivered in order; the only pauses
+        are the ones Discord's rate-limit headers ask for.
+
         Args:
             messages: List of post dictionaries
             channel_name: Name of the subreddit for display
@@ -128,18 +268,11 @@ class DiscordPoster:
         Returns:
             Number of successfully posted messages
         """
-        success_count = 0
-        for msg in messages:
-            if self.post_message(msg, channel_name):
-                success_count += 1
-            # Small delay to avoid rate limiting
-            import time
-            time.sleep(0.5)
+        payloads = [self._build_post_payload(msg, channel_name) for msg in messages]
+        return sum(self._send(payload, "Error posting to Discord") for payload in payloads)
 
-        return success_count
-
-    def post_keyword_match(self, item: Dict, channel_name: str = "Reddit", item_type: str = "post") -> bool:
-        """Post a keyword-matched post or comment to Discord.
+    def _build_keyword_payload(self, item: Dict, channel_name: str, item_type: str) -> Dict:
+        """Build the webhook payload for a keyword-matched post or comment.
 
         Args:
             item: Post or comment dictionary with keyword match information
@@ -147,10 +280,8 @@ class DiscordPoster:
             item_type: Either "post" or "comment"
 
         Returns:
-            True if successful, False otherwise
+            Webhook JSON payload
         """
-        import time
-
         # Extract common information
         author = item.get('author', '[deleted]')
         permalink = item.get('permalink', '')
@@ -172,7 +303,7 @@ class DiscordPoster:
                 text = text[:297] + "..."
 
             embed = {
-                "title": f"🔍 Keyword Match: Comment in r/{channel_name}",
+                "title": f"{_SEARCH} Keyword Match: Comment in r/{channel_name}",
                 "description": text,
                 "color": color,
                 "url": permalink,
@@ -194,7 +325,7 @@ class DiscordPoster:
                     },
                     {
                         "name": "Score",
-                        "value": f"⬆️ {score}",
+                        "value": f"{_ARROW_UP} {score}",
                         "inline": True
                     }
                 ],
@@ -226,7 +357,7 @@ class DiscordPoster:
             description = "\n".join(description_parts) if description_parts else "_No text content_"
 
             embed = {
-                "title": f"🔍 {title[:230]}",  # Leave room for emoji
+                "title": f"{_SEARCH} {title[:230]}",  # Leave room for emoji
                 "description": description,
                 "color": color,
                 "url": permalink,
@@ -248,12 +379,12 @@ class DiscordPoster:
                     },
                     {
                         "name": "Score",
-                        "value": f"⬆️ {score}",
+                        "value": f"{_ARROW_UP} {score}",
                         "inline": True
                     },
                     {
                         "name": "Comments",
-                        "value": f"💬 {num_comments}",
+                        "value": f"{_SPEECH} {num_comments}",
                         "inline": True
                     }
                 ],
@@ -269,17 +400,23 @@ class DiscordPoster:
                     "inline": True
                 })
 
-        payload = {
+        return {
             "embeds": [embed]
         }
 
-        try:
-            response = requests.post(self.webhook_url, json=payload, timeout=10)
-            response.raise_for_status()
-            return True
-        except requests.exceptions.RequestException as e:
-            print(f"Error posting keyword match to Discord: {e}")
-            return False
+    def post_keyword_match(self, item: Dict, channel_name: str = "Reddit", item_type: str = "post") -> bool:
+        """Post a keyword-matched post or comment to Discord.
+
+        Args:
+            item: Post or comment dictionary with keyword match information
+            channel_name: Name of the subreddit for display
+            item_type: Either "post" or "comment"
+
+        Returns:
+            True if successful, False otherwise
+        """
+        return self._send(self._build_keyword_payload(item, channel_name, item_type),
+                          "Error posting keyword match to Discord")
 
     def post_keyword_batch(self, items: list, channel_name: str = "Reddit", item_type: str = "post") -> int:
         """Post multiple keyword matches to Discord.
@@ -292,12 +429,6 @@ class DiscordPoster:
         Returns:
             Number of successfully posted items
         """
-        import time
-        success_count = 0
-        for item in items:
-            if self.post_keyword_match(item, channel_name, item_type):
-                success_count += 1
-            # Small delay to avoid rate limiting
-            time.sleep(0.5)
-
-        return success_count
+        payloads = [self._build_keyword_payload(item, channel_name, item_type) for item in items]
+        return sum(self._send(payload, "Error posting keyword match to Discord")
+                   for payload in payloads)
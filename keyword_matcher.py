@@ -1,8 +1,163 @@
 """Keyword matching and filtering module."""
 import re
-from typing import List, Dict, Optional, Iterable
+from typing import List, Dict, Optional, Iterable, Iterator
 import os
 import json
+import threading
+
+try:
+    import hyperscan
+except ImportError:  # optional: pip install hyperscan
+    hyperscan = None
+
+try:
+    import ahocorasick
+except ImportError:  # optional: pip install pyahocorasick
+    ahocorasick = None
+
+
+def _build_pattern(term: str) -> str:
+    """Build a whole-word/phrase regex for term.
+
+    Plain \\b...\\b anchors fail when a term begins or ends with a
+    non-word character (e.g. '#ad'), because \\b only fires at a
+    word/non-word transition. We instead assert "no adjacent word
+    character" only on the side where the term itself is a word
+    character, so punctuation-bounded terms still match.
+    """
+    prefix = r'(?<!\w)' if re.match(r'\w', term) else ''
+    suffix = r'(?!\w)' if re.search(r'\w$', term) else ''
+    return prefix + re.escape(term) + suffix
+
+
+def _is_word_char(char: str) -> bool:
+    """Return True if char is what the regex class \\w would match."""
+    return char.isalnum() or char == '_'
+
+
+class _RegexScanner:
+    """Find whole-word terms with the re module.
+
+    Most texts contain none of the terms, so one scan with a single
+    alternation of every term lets us skip the per-term searches entirely.
+    When matching is case-insensitive, terms and text are lowercased up
+    front so the searches can skip re's IGNORECASE path.
+    """
+
+    def __init__(self, terms: List[str], case_sensitive: bool):
+        self.terms = terms
+        self._case_sensitive = case_sensitive
+        search_terms = terms if case_sensitive else [term.lower() for term in terms]
+        self._gate = re.compile('|'.join(_build_pattern(term) for term in search_terms))
+        self._patterns = [(term, re.compile(_build_pattern(search_term)))
+                          for term, search_term in zip(terms, search_terms)]
+
+    def find(self, text: str) -> List[str]:
+        search_text = text if self._case_sensitive else text.lower()
+        if not self._gate.search(search_text):
+            return []
+        return [term for term, pattern in self._patterns if pattern.search(search_text)]
+
+
+class _AhoCorasickScanner:
+    """Find whole-word terms with an Aho-Corasick automaton.
+
+    Every term is found in a single pass over the text regardless of how
+    many are configured; word boundaries are then checked by looking at the
+    characters either side of each hit, mirroring _build_pattern.
+    """
+
+    def __init__(self, terms: List[str], case_sensitive: bool):
+        self.terms = terms
+        self._case_sensitive = case_sensitive
+
+        # Terms that differ only in case share a key when case-insensitive
+        grouped = {}
+        for term in terms:
+            key = term if case_sensitive else term.lower()
+            grouped.setdefault(key, []).append(term)
+
+        self._automaton = ahocorasick.Automaton()
+        for key, originals in grouped.items():
+            self._automaton.add_word(key, (len(key), _is_word_char(key[0]),
+                                           _is_word_char(key[-1]), originals))
+        self._automaton.make_automaton()
+
+    def find(self, text: str) -> List[str]:
+        search_text = text if self._case_sensitive else text.lower()
+        last = len(search_text) - 1
+        hits = set()
+        for end, (length, check_before, check_after, originals) in self._automaton.iter(search_text):
+            start = end - length + 1
+            if check_before and start > 0 and _is_word_char(search_text[start - 1]):
+                continue
+            if check_after and end < last and _is_word_char(search_text[end + 1]):
+                continue
+            hits.update(originals)
+        return [term for term in self.terms if term in hits]
+
+
+class _HyperscanScanner:
+    """Find whole-word terms with a Hyperscan database.
+
+    Hyperscan matches every term in one SIMD-accelerated pass over the
+    UTF-8 bytes. It cannot combine Unicode mode with \\b or lookbehind, so
+    terms are compiled as plain literals and the word-boundary rule from
+    _build_pattern is applied to the characters either side of each hit.
+    """
+
+    def __init__(self, terms: List[str], case_sensitive: bool):
+        self.terms = terms
+        self._boundaries = [(_is_word_char(term[0]), _is_word_char(term[-1])) for term in terms]
+
+        flags = hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP | hyperscan.HS_FLAG_SOM_LEFTMOST
+        if not case_sensitive:
+            flags |= hyperscan.HS_FLAG_CASELESS
+        self._database = hyperscan.Database()
+        self._database.compile(
+            expressions=[re.escape(term).encode('utf-8') for term in terms],
+            ids=list(range(len(terms))),
+            elements=len(terms),
+            flags=[flags] * len(terms),
+        )
+        self._scratch = hyperscan.Scratch(self._database)
+        # Scratch space can't be shared between concurrent scans
+        self._local = threading.local()
+
+    def find(self, text: str) -> List[str]:
+        scratch = getattr(self._local, 'scratch', None)
+        if scratch is None:
+            scratch = self._local.scratch = self._scratch.clone()
+
+        data = text.encode('utf-8', 'replace')
+        hits = set()
+
+        def on_match(term_id, start, end, flags, context):
+            check_before, check_after = self._boundaries[term_id]
+            if check_before and start > 0 and _is_word_char(_char_before(data, start)):
+                return
+            if check_after and end < len(data) and _is_word_char(_char_at(data, end)):
+                return
+            hits.add(term_id)
+
+        self._database.scan(data, match_event_handler=on_match, scratch=scratch)
+        return [term for term_id, term in enumerate(self.terms) if term_id in hits]
+
+
+def _char_before(data: bytes, offset: int) -> str:
+    """Decode the UTF-8 character that ends just before offset."""
+    start = offset - 1
+    while start > 0 and data[start] & 0xC0 == 0x80:
+        start -= 1
+    return data[start:offset].decode('utf-8', 'replace')
+
+
+def _char_at(data: bytes, offset: int) -> str:
+    """Decode the UTF-8 character that starts at offset."""
+    end = offset + 1
+    while end < len(data) and data[end] & 0xC0 == 0x80:
+        end += 1
+    return data[offset:end].decode('utf-8', 'replace')
 
 
 class KeywordMatcher:
@@ -26,6 +181,8 @@ class KeywordMatcher:
         self.case_sensitive = False
         self.search_posts = True
         self.search_comments = True
+        self._keyword_scanner = None
+        self._blacklist_scanner = None
         self._load_config()
 
     def _load_config(self):
@@ -44,6 +201,10 @@ class KeywordMatcher:
                 self.search_comments = config.get('search_comments', True)
         except (IOError, json.JSONDecodeError) as e:
             print(f"Error reading keyword config: {e}")
+            return
+
+        self._keyword_scanner = self._compile_scanner(self.keywords)
+        self._blacklist_scanner = self._compile_scanner(self.blacklist)
 
     @staticmethod
     def _clean_terms(terms, label: str) -> List[str]:
@@ -64,36 +225,34 @@ class KeywordMatcher:
                 print(f"Warning: ignoring invalid {label} entry: {term!r}")
         return cleaned
 
-    @staticmethod
-    def _build_pattern(term: str) -> str:
-        """Build a whole-word/phrase regex for term.
-
-        Plain \\b...\\b anchors fail when a term begins or ends with a
-        non-word character (e.g. '#ad'), because \\b only fires at a
-        word/non-word transition. We instead assert "no adjacent word
-        character" only on the side where the term itself is a word
-        character, so punctuation-bounded terms still match.
-        """
-        prefix = r'(?<!\w)' if re.match(r'\w', term) else ''
-        suffix = r'(?!\w)' if re.search(r'\w$', term) else ''
-        return prefix + re.escape(term) + suffix
+    def _compile_scanner(self, terms: List[str]):
+        """Build the matcher used to search text for terms.
 
-    def _find_matches(self, text: str, terms: List[str]) -> List[str]:
+        Prefers Hyperscan, then Aho-Corasick, depending on which optional
+        package is installed, and falls back to the regex scanner otherwise;
+        all of them return the same matches.
+        """
+        if not terms:
+            return None
+        if hyperscan is not None:
+            return _HyperscanScanner(terms, self.case_sensitive)
+        if ahocorasick is not None:
+            return _AhoCorasickScanner(terms, self.case_sensitive)
+        return _RegexScanner(terms, self.case_sensitive)
+
+    def _find_matches(self, text: str, scanner) -> List[str]:
         """Return every term that appears in text as a whole word/phrase.
 
         Args:
             text: Text to search
-            terms: Terms to look for
+            scanner: Scanner for the terms to look for, from _compile_scanner
 
         Returns:
-            List of matched terms (empty if none)
+            List of matched terms in configured order (empty if none)
         """
-        if not text or not terms:
+        if not text or scanner is None:
             return []
-
-        flags = 0 if self.case_sensitive else re.IGNORECASE
-        return [term for term in terms
-                if re.search(self._build_pattern(term), text, flags=flags)]
+        return scanner.find(text)
 
     def matches_keyword(self, text: str) -> List[str]:
         """Check if text contains any configured keywords.
@@ -104,7 +263,7 @@ class KeywordMatcher:
         Returns:
             List of matched keywords (empty if no matches)
         """
-        return self._find_matches(text, self.keywords)
+        return self._find_matches(text, self._keyword_scanner)
 
     def blacklisted_phrase(self, *texts: str) -> Optional[str]:
         """Return the first blacklisted phrase found across texts, or None.
@@ -116,7 +275,7 @@ class KeywordMatcher:
             The matched blacklist phrase, or None if nothing matched
         """
         for text in texts:
-            found = self._find_matches(text, self.blacklist)
+            found = self._find_matches(text, self._blacklist_scanner)
             if found:
                 return found[0]
         return None
@@ -155,19 +314,18 @@ class KeywordMatcher:
         return [post for post in posts
                 if not self._is_blacklisted(post, self.POST_BLACKLIST_FIELDS)]
 
-    def filter_posts(self, posts: List[Dict]) -> List[Dict]:
+    def filter_posts(self, posts: Iterable[Dict]) -> Iterator[Dict]:
         """Filter posts that match keywords.
 
         Args:
-            posts: List of post dictionaries
+            posts: Iterable of post dictionaries
 
-        Returns:
-            List of posts with keyword matches, including 'matched_keywords' field
+        Yields:
+            Posts with keyword matches, including 'matched_keywords' field
         """
         if not self.search_posts or not self.keywords:
-            return []
+            return
 
-        matching_posts = []
         for post in posts:
             # Blacklist takes final authority — skip post if any field matches
             if self._is_blacklisted(post, self.POST_BLACKLIST_FIELDS):
@@ -176,7 +334,7 @@ class KeywordMatcher:
             title_matches = self.matches_keyword(post.get('title', ''))
             text_matches = self.matches_keyword(post.get('text', ''))
 
-            all_matches = list(set(title_matches + text_matches))
+            all_matches = list(set(title_matches).union(text_matches))
 
             if all_matches:
                 post_copy = post.copy()
@@ -186,23 +344,20 @@ class KeywordMatcher:
                     post_copy['match_location'].append('title')
                 if text_matches:
                     post_copy['match_location'].append('body')
-                matching_posts.append(post_copy)
-
-        return matching_posts
+                yield post_copy
 
-    def filter_comments(self, comments: List[Dict]) -> List[Dict]:
+    def filter_comments(self, comments: Iterable[Dict]) -> Iterator[Dict]:
         """Filter comments that match keywords.
 
         Args:
-            comments: List of comment dictionaries
+            comments: Iterable of comment dictionaries
 
-        Returns:
-            List of comments with keyword matches, including 'matched_keywords' field
+        Yields:
+            Comments with keyword matches, including 'matched_keywords' field
         """
         if not self.search_comments or not self.keywords:
-            return []
+            return
 
-        matching_comments = []
         for comment in comments:
             # Blacklist takes final authority — screen the comment body and the
             # title of the post it belongs to.
@@ -215,9 +370,7 @@ class KeywordMatcher:
                 comment_copy = comment.copy()
                 comment_copy['matched_keywords'] = matches
                 comment_copy['match_location'] = ['comment']
-                matching_comments.append(comment_copy)
-
-        return matching_comments
+                yield comment_copy
 
     def get_keywords(self) -> List[str]:
         """Get the list of configured keywords.
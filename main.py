@@ -2,8 +2,12 @@
 """Main script for Reddit to Discord monitor."""
 import os
 import time
+import atexit
 import sys
 import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+import praw
 from dotenv import load_dotenv
 
 from reddit_monitor import RedditMonitor
@@ -11,6 +15,11 @@ from discord_poster import DiscordPoster
 from state_manager import StateManager
 from keyword_matcher import KeywordMatcher
 
+# Upper bound on subreddits checked at the same time
+MAX_WORKERS = 16
+
+log = logging.getLogger("subwatch")
+
 
 def load_subreddit_config(config_file: str = "subreddits.json") -> list:
     """Load subreddit configuration from JSON file.
@@ -22,8 +31,8 @@ def load_subreddit_config(config_file: str = "subreddits.json") -> list:
         List of subreddit configuration dictionaries
     """
     if not os.path.exists(config_file):
-        print(f"Error: Configuration file '{config_file}' not found")
-        print("Please create subreddits.json with your subreddit-webhook mappings")
+        log.error("Error: Configuration file '%s' not found", config_file)
+        log.error("Please create subreddits.json with your subreddit-webhook mappings")
         sys.exit(1)
 
     try:
@@ -32,15 +41,126 @@ def load_subreddit_config(config_file: str = "subreddits.json") -> list:
             # Filter only enabled subreddits
             return [sub for sub in config if sub.get('enabled', True)]
     except (IOError, json.JSONDecodeError) as e:
-        print(f"Error reading configuration file: {e}")
+        log.error("Error reading configuration file: %s", e)
         sys.exit(1)
 
 
+def check_subreddit(item: dict, state: StateManager,
+                    keyword_matcher: KeywordMatcher, keywords_enabled: bool):
+    """Run one monitoring pass for a single configured subreddit.
+
+    Args:
+        item: Monitor entry built in main()
+        state: Shared state manager
+        keyword_matcher: Shared keyword matcher
+        keywords_enabled: Whether any keywords are configured
+    """
+    subreddit_name = item['subreddit']
+    monitor = item['monitor']
+    poster = item['poster']
+    monitor_posts = item['monitor_posts']
+    monitor_keywords = item['monitor_keywords']
+    keyword_poster = item['keyword_poster']
+
+    # Get last check timestamps for this subreddit
+    last_check_posts, last_check_comments = state.get_last_checks(
+        (f"{subreddit_name}_posts", f"{subreddit_name}_comments"))
+
+    # Monitor regular posts
+    if monitor_posts:
+        if last_check_posts:
+            log.info("[r/%s] Checking for new posts...", subreddit_name)
+        else:
+            log.info("[r/%s] First run - checking recent posts...", subreddit_name)
+
+        # Fetch new posts. The timestamp advances based on everything
+        # fetched, even blacklisted posts, so suppressed content isn't
+        # re-checked.
+        posts, latest_ts = monitor.get_posts_since(last_check_posts)
+
+        if posts:
+            # Blacklist is the final authority — never post suppressed content
+            postable = keyword_matcher.remove_blacklisted_posts(posts)
+            suppressed = len(posts) - len(postable)
+
+            if suppressed:
+                log.info("[r/%s] Found %d new post(s) (%d suppressed by blacklist)",
+                         subreddit_name, len(posts), suppressed)
+            else:
+                log.info("[r/%s] Found %d new post(s)", subreddit_name, len(posts))
+
+            # Post to Discord
+            if postable:
+                success_count = poster.post_batch(postable, subreddit_name)
+                log.info("[r/%s] Posted %d/%d post(s) to Discord",
+                         subreddit_name, success_count, len(postable))
+
+            # Update last check timestamp to the most recent post
+            state.save_last_check(f"{subreddit_name}_posts", latest_ts)
+        else:
+            log.debug("[r/%s] No new posts", subreddit_name)
+
+    # Monitor for keywords
+    if monitor_keywords and keyword_poster and keywords_enabled:
+        if last_check_comments:
+            log.info("[r/%s] Checking for keyword matches...", subreddit_name)
+        else:
+            log.info("[r/%s] First keyword check...", subreddit_name)
+
+        # Stream new posts and comments straight through the keyword filter;
+        # only the matches are kept.
+        matched_posts = list(keyword_matcher.filter_posts(
+            monitor.iter_posts_since(last_check_comments)))
+        matched_comments = list(keyword_matcher.filter_comments(
+            monitor.iter_comments_since(last_check_comments)))
+        latest_ts = max(monitor.newest_post_ts or 0, monitor.newest_comment_ts or 0) or None
+
+        total_matches = len(matched_posts) + len(matched_comments)
+
+        if total_matches > 0:
+            log.info("[r/%s] Found %d keyword match(es) (%d posts, %d comments)",
+                     subreddit_name, total_matches, len(matched_posts), len(matched_comments))
+
+            # Post keyword matches to Discord
+            if matched_posts:
+                success = keyword_poster.post_keyword_batch(matched_posts, subreddit_name, "post")
+                log.info("[r/%s] Posted %d/%d matched post(s)",
+                         subreddit_name, success, len(matched_posts))
+
+            if matched_comments:
+                success = keyword_poster.post_keyword_batch(matched_comments, subreddit_name, "comment")
+                log.info("[r/%s] Posted %d/%d matched comment(s)",
+                         subreddit_name, success, len(matched_comments))
+
+            # Update timestamp based on most recent item
+            if latest_ts:
+                state.save_last_check(f"{subreddit_name}_comments", latest_ts)
+        else:
+            log.debug("[r/%s] No keyword matches", subreddit_name)
+
+            # Still update timestamp if we checked anything
+            if latest_ts:
+                state.save_last_check(f"{subreddit_name}_comments", latest_ts)
+
+
 def main():
     """Main function to run the monitor."""
     # Load environment variables
     load_dotenv()
 
+    # Accept level names (DEBUG, INFO, ...) or numbers; anything else would
+    # make basicConfig raise, so fall back to INFO
+    log_level = (os.getenv('LOG_LEVEL') or 'INFO').strip().upper()
+    level = int(log_level) if log_level.isdigit() else logging.getLevelName(log_level)
+    level_valid = isinstance(level, int)
+    logging.basicConfig(
+        level=level if level_valid else logging.INFO,
+        format="%(asctime)s %(message)s",
+        stream=sys.stdout,
+    )
+    if not level_valid:
+        log.warning("Warning: Unknown LOG_LEVEL %r, using INFO", log_level)
+
     # Get Reddit API credentials
     reddit_client_id = os.getenv('REDDIT_CLIENT_ID')
     reddit_client_secret = os.getenv('REDDIT_CLIENT_SECRET')
@@ -49,30 +169,44 @@ def main():
 
     # Validate Reddit credentials
     if not reddit_client_id:
-        print("Error: REDDIT_CLIENT_ID not set in .env file")
+        log.error("Error: REDDIT_CLIENT_ID not set in .env file")
         sys.exit(1)
     if not reddit_client_secret:
-        print("Error: REDDIT_CLIENT_SECRET not set in .env file")
+        log.error("Error: REDDIT_CLIENT_SECRET not set in .env file")
         sys.exit(1)
 
     # Load subreddit configuration
     subreddit_configs = load_subreddit_config()
 
     if not subreddit_configs:
-        print("Error: No enabled subreddits found in subreddits.json")
+        log.error("Error: No enabled subreddits found in subreddits.json")
         sys.exit(1)
 
     # Initialize state manager
     state = StateManager()
+    # Don't lose updates still waiting for the next flush on shutdown
+    atexit.register(state.flush)
 
     # Initialize keyword matcher
     keyword_matcher = KeywordMatcher()
     keywords_enabled = len(keyword_matcher.get_keywords()) > 0
 
     if keywords_enabled:
-        print(f"Keyword monitoring enabled: {', '.join(keyword_matcher.get_keywords())}")
+        log.info("Keyword monitoring enabled: %s", ', '.join(keyword_matcher.get_keywords()))
     else:
-        print("Keyword monitoring disabled (no keywords configured)")
+        log.info("Keyword monitoring disabled (no keywords configured)")
+
+    # One Reddit client shared by every monitor: a single OAuth token,
+    # connection pool and rate-limit tracker
+    reddit = praw.Reddit(
+        client_id=reddit_client_id,
+        client_secret=reddit_client_secret,
+        user_agent=reddit_user_agent
+    )
+
+    # One poster per webhook URL, so subreddits sharing a webhook also share
+    # its rate-limit bucket instead of each tracking (and exceeding) it alone
+    posters = {}
 
     # Initialize monitors for each subreddit
     monitors = []
@@ -84,22 +218,26 @@ def main():
         keyword_webhook_url = config.get('keyword_webhook_url', '')
 
         if not subreddit_name or not webhook_url:
-            print(f"Warning: Invalid configuration entry: {config}")
+            log.warning("Warning: Invalid configuration entry: %s", config)
             continue
 
         # Create monitor and poster for this subreddit
-        monitor = RedditMonitor(reddit_client_id, reddit_client_secret, reddit_user_agent, subreddit_name)
-        poster = DiscordPoster(webhook_url)
+        monitor = RedditMonitor(reddit, subreddit_name)
+        if webhook_url not in posters:
+            posters[webhook_url] = DiscordPoster(webhook_url)
+        poster = posters[webhook_url]
 
         # Test connection
         if not monitor.test_connection():
-            print(f"Warning: Failed to connect to r/{subreddit_name}, skipping...")
+            log.warning("Warning: Failed to connect to r/%s, skipping...", subreddit_name)
             continue
 
         # Create keyword poster if keyword monitoring is enabled
         keyword_poster = None
         if monitor_keywords and keywords_enabled and keyword_webhook_url:
-            keyword_poster = DiscordPoster(keyword_webhook_url)
+            if keyword_webhook_url not in posters:
+                posters[keyword_webhook_url] = DiscordPoster(keyword_webhook_url)
+            keyword_poster = posters[keyword_webhook_url]
 
         monitors.append({
             'subreddit': subreddit_name,
@@ -116,118 +254,47 @@ def main():
         if monitor_keywords and keyword_poster:
             monitoring_status.append("keywords")
 
-        print(f"✓ Configured r/{subreddit_name} ({', '.join(monitoring_status)})")
+        log.info("✓ Configured r/%s (%s)", subreddit_name, ', '.join(monitoring_status))
 
     if not monitors:
-        print("Error: No valid subreddit monitors could be initialized")
+        log.error("Error: No valid subreddit monitors could be initialized")
         sys.exit(1)
 
-    print(f"\nMonitoring {len(monitors)} subreddit(s)")
-    print(f"Check interval: {check_interval} seconds")
-    print("Press Ctrl+C to stop\n")
+    log.info("Monitoring %d subreddit(s)", len(monitors))
+    log.info("Check interval: %d seconds", check_interval)
+    log.info("Press Ctrl+C to stop")
 
+    # Check subreddits concurrently; each one spends its time waiting on its
+    # own Reddit and Discord round-trips. The pool lives for the whole run so
+    # worker threads are reused from cycle to cycle.
+    executor = ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(monitors)))
+    futures = []
     try:
         while True:
-            # Check each subreddit
-            for item in monitors:
-                subreddit_name = item['subreddit']
-                monitor = item['monitor']
-                poster = item['poster']
-                monitor_posts = item['monitor_posts']
-                monitor_keywords = item['monitor_keywords']
-                keyword_poster = item['keyword_poster']
-
-                # Get last check timestamps for this subreddit
-                last_check_posts = state.get_last_check(f"{subreddit_name}_posts")
-                last_check_comments = state.get_last_check(f"{subreddit_name}_comments")
-
-                # Monitor regular posts
-                if monitor_posts:
-                    if last_check_posts:
-                        print(f"[r/{subreddit_name}] Checking for new posts...")
-                    else:
-                        print(f"[r/{subreddit_name}] First run - checking recent posts...")
-
-                    # Fetch new posts
-                    posts = monitor.get_posts_since(last_check_posts)
-
-                    if posts:
-                        # Advance the timestamp based on everything fetched, even
-                        # blacklisted posts, so suppressed content isn't re-checked.
-                        latest_ts = max(post['ts'] for post in posts)
-
-                        # Blacklist is the final authority — never post suppressed content
-                        postable = keyword_matcher.remove_blacklisted_posts(posts)
-                        suppressed = len(posts) - len(postable)
-
-                        print(f"[r/{subreddit_name}] Found {len(posts)} new post(s)" +
-                              (f" ({suppressed} suppressed by blacklist)" if suppressed else ""))
-
-                        # Post to Discord
-                        if postable:
-                            success_count = poster.post_batch(postable, subreddit_name)
-                            print(f"[r/{subreddit_name}] Posted {success_count}/{len(postable)} post(s) to Discord")
-
-                        # Update last check timestamp to the most recent post
-                        state.save_last_check(f"{subreddit_name}_posts", latest_ts)
-                    else:
-                        print(f"[r/{subreddit_name}] No new posts")
-
-                # Monitor for keywords
-                if monitor_keywords and keyword_poster and keywords_enabled:
-                    if last_check_comments:
-                        print(f"[r/{subreddit_name}] Checking for keyword matches...")
-                    else:
-                        print(f"[r/{subreddit_name}] First keyword check...")
-
-                    # Fetch posts and comments for keyword matching
-                    recent_posts = monitor.get_posts_since(last_check_comments)
-                    recent_comments = monitor.get_comments_since(last_check_comments)
-
-                    # Filter for keyword matches
-                    matched_posts = keyword_matcher.filter_posts(recent_posts)
-                    matched_comments = keyword_matcher.filter_comments(recent_comments)
-
-                    total_matches = len(matched_posts) + len(matched_comments)
-
-                    if total_matches > 0:
-                        print(f"[r/{subreddit_name}] Found {total_matches} keyword match(es) ({len(matched_posts)} posts, {len(matched_comments)} comments)")
-
-                        # Post keyword matches to Discord
-                        if matched_posts:
-                            success = keyword_poster.post_keyword_batch(matched_posts, subreddit_name, "post")
-                            print(f"[r/{subreddit_name}] Posted {success}/{len(matched_posts)} matched post(s)")
-
-                        if matched_comments:
-                            success = keyword_poster.post_keyword_batch(matched_comments, subreddit_name, "comment")
-                            print(f"[r/{subreddit_name}] Posted {success}/{len(matched_comments)} matched comment(s)")
-
-                        # Update timestamp based on most recent item
-                        all_items = recent_posts + recent_comments
-                        if all_items:
-                            latest_ts = max(item['ts'] for item in all_items)
-                            state.save_last_check(f"{subreddit_name}_comments", latest_ts)
-                    else:
-                        print(f"[r/{subreddit_name}] No keyword matches")
-
-                        # Still update timestamp if we checked anything
-                        all_items = recent_posts + recent_comments
-                        if all_items:
-                            latest_ts = max(item['ts'] for item in all_items)
-                            state.save_last_check(f"{subreddit_name}_comments", latest_ts)
+            futures = [executor.submit(check_subreddit, item, state,
+                                       keyword_matcher, keywords_enabled)
+                       for item in monitors]
+            for future in futures:
+                future.result()
+            # Persist the timestamps saved during the cycle
+            state.flush()
 
             # Wait for next check
-            print(f"\nNext check in {check_interval} seconds...\n")
+            log.info("Next check in %d seconds...", check_interval)
             time.sleep(check_interval)
 
     except KeyboardInterrupt:
-        print("\nStopping monitor...")
+        log.info("Stopping monitor...")
         sys.exit(0)
     except Exception as e:
-        print(f"Error: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception("Error: %s", e)
         sys.exit(1)
+    finally:
+        # Drop the checks still queued for this cycle instead of waiting for
+        # all of them (and their rate-limit sleeps) before exiting
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False)
 
 
 if __name__ == '__main__':
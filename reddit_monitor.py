@@ -1,82 +1,251 @@
 """Reddit subreddit monitoring module."""
+import threading
 import time
-from typing import List, Dict, Optional
+from collections import deque
+from itertools import islice
+from typing import Deque, Iterator, List, Dict, Optional, Tuple
 import praw
 from praw.exceptions import PRAWException
 
+# PRAW is not thread-safe and the monitors share one Reddit instance, so
+# requests made through it from concurrently checked subreddits are serialized.
+_reddit_lock = threading.Lock()
+
 
 class RedditMonitor:
     """Monitor Reddit subreddit for new posts."""
 
-    def __init__(self, client_id: str, client_secret: str, user_agent: str, subreddit_name: str):
-        """Initialize Reddit client.
+    # The streams are drained at most once per this many seconds, so the post
+    # and keyword passes of one monitoring cycle share a single request.
+    CACHE_TTL = 30
+    # How many of the most recent posts/comments are kept for filtering; also
+    # the size of a full page of stream results
+    FETCH_LIMIT = 100
+
+    def __init__(self, reddit: praw.Reddit, subreddit_name: str):
+        """Initialize subreddit monitor.
 
         Args:
-            client_id: Reddit app client ID
-            client_secret: Reddit app client secret
-            user_agent: User agent string for Reddit API
+            reddit: Reddit client, shared by all monitors so they reuse one
+                OAuth token, connection pool and rate-limit tracker
             subreddit_name: Subreddit name to monitor (without r/)
         """
-        self.reddit = praw.Reddit(
-            client_id=client_id,
-            client_secret=client_secret,
-            user_agent=user_agent
-        )
+        self.reddit = reddit
         self.subreddit_name = subreddit_name
         self.subreddit = self.reddit.subreddit(subreddit_name)
 
-    def get_posts_since(self, timestamp: Optional[float] = None) -> List[Dict]:
-        """Fetch posts from the subreddit since a given timestamp.
+        # Rolling windows of the newest items seen on each stream, oldest first
+        self._post_stream = None
+        self._posts = deque(maxlen=self.FETCH_LIMIT)
+        self._posts_refreshed = None
+        self._comment_stream = None
+        self._comments = deque(maxlen=self.FETCH_LIMIT)
+        self._comments_refreshed = None
+
+        # Timestamp of the newest item yielded by the last iter_*_since call
+        self.newest_post_ts = None
+        self.newest_comment_ts = None
+
+    def get_post_stream(self) -> Iterator:
+        """Open a stream of new submissions.
+
+        The stream yields existing posts from its first request (so a restart
+        can catch up on anything missed) and then only unseen ones. With
+        pause_after=-1 it yields None after every request instead of
+        sleeping, so draining it up to None costs exactly one request.
+
+        Returns:
+            PRAW submission stream
+        """
+        return self.subreddit.stream.submissions(pause_after=-1)
+
+    def get_comment_stream(self) -> Iterator:
+        """Open a stream of new comments; see get_post_stream.
+
+        Returns:
+            PRAW comment stream
+        """
+        return self.subreddit.stream.comments(pause_after=-1)
+
+    @staticmethod
+    def _post_data(submission) -> Dict:
+        """Build the post dictionary for a submission."""
+        return {
+            'title': submission.title,
+            'text': submission.selftext if submission.is_self else '',
+            'url': submission.url,
+            'permalink': f"https://www.reddit.com{submission.permalink}",
+            'author': str(submission.author) if submission.author else '[deleted]',
+            'ts': submission.created_utc,
+            'score': submission.score,
+            'num_comments': submission.num_comments,
+            'is_self': submission.is_self,
+            'link_flair_text': submission.link_flair_text or '',
+            'over_18': submission.over_18,
+            'spoiler': submission.spoiler,
+            'stickied': submission.stickied,
+        }
+
+    @staticmethod
+    def _has_author(comment) -> bool:
+        """Check whether a comment still has its author (not deleted/removed)."""
+        return comment.author is not None
+
+    @staticmethod
+    def _comment_data(comment) -> Dict:
+        """Build the comment dictionary for a comment."""
+        # The listing already carries the parent post's title and permalink;
+        # going through comment.submission would fetch the post separately
+        # for every comment.
+        return {
+            'text': comment.body,
+            'author': str(comment.author),
+            'ts': comment.created_utc,
+            'score': comment.score,
+            'permalink': f"https://www.reddit.com{comment.permalink}",
+            'post_title': getattr(comment, 'link_title', ''),
+            'post_url': getattr(comment, 'link_permalink', ''),
+        }
+
+    @staticmethod
+    def _drain(stream: Iterator, window: Deque[Dict], to_data, keep=None) -> int:
+        """Append the items of one stream request to a rolling window.
 
         Args:
-            timestamp: Unix timestamp to fetch posts after. If None, fetches recent posts.
+            stream: Stream opened with pause_after=-1
+            window: Rolling window to append the item dictionaries to
+            to_data: Builds the dictionary for an item
+            keep: Optional predicate; items it rejects are not appended
 
         Returns:
-            List of post dictionaries with relevant information
+            Number of items the request returned, including rejected ones
         """
-        try:
-            posts = []
-
-            # Fetch recent posts from the subreddit
-            limit = 100 if timestamp else 10
-
-            for submission in self.subreddit.new(limit=limit):
-                post_timestamp = submission.created_utc
-
-                # Skip posts older than our last check
-                if timestamp and post_timestamp <= timestamp:
-                    continue
-
-                # Build post data
-                post_data = {
-                    'title': submission.title,
-                    'text': submission.selftext if submission.is_self else '',
-                    'url': submission.url,
-                    'permalink': f"https://www.reddit.com{submission.permalink}",
-                    'author': str(submission.author) if submission.author else '[deleted]',
-                    'ts': post_timestamp,
-                    'score': submission.score,
-                    'num_comments': submission.num_comments,
-                    'is_self': submission.is_self,
-                    'link_flair_text': submission.link_flair_text or '',
-                    'over_18': submission.over_18,
-                    'spoiler': submission.spoiler,
-                    'stickied': submission.stickied,
-                }
-
-                posts.append(post_data)
-
-            # Sort by timestamp (oldest first)
-            posts.sort(key=lambda x: x['ts'])
+        count = 0
+        for item in stream:
+            if item is None:
+                break
+            count += 1
+            if keep is None or keep(item):
+                window.append(to_data(item))
+        return count
+
+    def _is_stale(self, refreshed: Optional[float]) -> bool:
+        """Check whether a stream drained at refreshed is due for another drain."""
+        return refreshed is None or time.monotonic() - refreshed >= self.CACHE_TTL
 
-            return posts
+    def _recent_posts(self) -> Deque[Dict]:
+        """Return the rolling window of the subreddit's newest posts.
 
+        Returns:
+            Post dictionaries in the order they were fetched (oldest first)
+        """
+        if self._is_stale(self._posts_refreshed):
+            reopened = self._post_stream is None
+            if reopened:
+                self._post_stream = self.get_post_stream()
+                self._posts.clear()
+            try:
+                with _reddit_lock:
+                    count = self._drain(self._post_stream, self._posts, self._post_data)
+                    if count >= self.FETCH_LIMIT and not reopened:
+                        # A full page means more posts arrived than one request
+                        # returns. The stream pages forward from the newest post
+                        # it has seen, so it would fall further behind every
+                        # cycle; start over from the newest posts instead.
+                        self._post_stream = self.get_post_stream()
+                        self._posts.clear()
+                        self._drain(self._post_stream, self._posts, self._post_data)
+            except Exception:
+                # A generator that raised is finished; reopen it next time
+                self._post_stream = None
+                raise
+            self._posts_refreshed = time.monotonic()
+        return self._posts
+
+    def _recent_comments(self) -> Deque[Dict]:
+        """Return the rolling window of the subreddit's newest comments.
+
+        Deleted/removed comments are skipped.
+
+        Returns:
+            Comment dictionaries in the order they were fetched (oldest first)
+        """
+        if self._is_stale(self._comments_refreshed):
+            reopened = self._comment_stream is None
+            if reopened:
+                self._comment_stream = self.get_comment_stream()
+                self._comments.clear()
+            try:
+                with _reddit_lock:
+                    count = self._drain(self._comment_stream, self._comments,
+                                        self._comment_data, self._has_author)
+                    if count >= self.FETCH_LIMIT and not reopened:
+                        # Fell behind; see _recent_posts
+                        self._comment_stream = self.get_comment_stream()
+                        self._comments.clear()
+                        self._drain(self._comment_stream, self._comments,
+                                    self._comment_data, self._has_author)
+            except Exception:
+                # A generator that raised is finished; reopen it next time
+                self._comment_stream = None
+                raise
+            self._comments_refreshed = time.monotonic()
+        return self._comments
+
+    def iter_posts_since(self, timestamp: Optional[float] = None) -> Iterator[Dict]:
+        """Iterate over posts from the subreddit since a given timestamp.
+
+        Posts are yielded in the order they were fetched without building an
+        intermediate list. As they are consumed, newest_post_ts is updated to
+        the timestamp of the newest post yielded so far.
+
+        Args:
+            timestamp: Unix timestamp to fetch posts after. If None, fetches recent posts.
+
+        Returns:
+            Iterator of post dictionaries with relevant information
+        """
+        self.newest_post_ts = None
+        return self._iter_posts(timestamp)
+
+    def _iter_posts(self, timestamp: Optional[float]) -> Iterator[Dict]:
+        """Generator behind iter_posts_since."""
+        try:
+            window = self._recent_posts()
         except PRAWException as e:
             print(f"Error fetching posts from Reddit: {e}")
-            return []
+            return
         except Exception as e:
             print(f"Unexpected error: {e}")
-            return []
+            return
+
+        # Only look at the most recent few posts on the first run
+        limit = 100 if timestamp else 10
+
+        for post in islice(window, max(len(window) - limit, 0), None):
+            # Skip posts older than our last check
+            if timestamp and post['ts'] <= timestamp:
+                continue
+            if self.newest_post_ts is None or post['ts'] > self.newest_post_ts:
+                self.newest_post_ts = post['ts']
+            yield post
+
+    def get_posts_since(self, timestamp: Optional[float] = None,
+                        sort: bool = True) -> Tuple[List[Dict], Optional[float]]:
+        """Fetch posts from the subreddit since a given timestamp.
+
+        Args:
+            timestamp: Unix timestamp to fetch posts after. If None, fetches recent posts.
+            sort: Sort the posts by timestamp (oldest first)
+
+        Returns:
+            Tuple of (post dictionaries, timestamp of the newest one or None
+            if there are none)
+        """
+        posts = list(self.iter_posts_since(timestamp))
+        if sort:
+            posts.sort(key=lambda x: x['ts'])
+        return posts, self.newest_post_ts
 
     def get_subreddit_name(self) -> str:
         """Get the subreddit name for display purposes.
@@ -85,60 +254,65 @@ class RedditMonitor:
             Subreddit display name
         """
         try:
-            return self.subreddit.display_name
+            with _reddit_lock:
+                return self.subreddit.display_name
         except PRAWException:
             return self.subreddit_name
 
-    def get_comments_since(self, timestamp: Optional[float] = None) -> List[Dict]:
-        """Fetch comments from the subreddit since a given timestamp.
+    def iter_comments_since(self, timestamp: Optional[float] = None) -> Iterator[Dict]:
+        """Iterate over comments from the subreddit since a given timestamp.
+
+        Comments are yielded in the order they were fetched without building
+        an intermediate list. As they are consumed, newest_comment_ts is
+        updated to the timestamp of the newest comment yielded so far.
 
         Args:
             timestamp: Unix timestamp to fetch comments after. If None, fetches recent comments.
 
         Returns:
-            List of comment dictionaries with relevant information
+            Iterator of comment dictionaries with relevant information
         """
-        try:
-            comments = []
+        self.newest_comment_ts = None
+        return self._iter_comments(timestamp)
 
-            # Fetch recent comments from the subreddit
-            limit = 100 if timestamp else 10
-
-            for comment in self.subreddit.comments(limit=limit):
-                comment_timestamp = comment.created_utc
+    def _iter_comments(self, timestamp: Optional[float]) -> Iterator[Dict]:
+        """Generator behind iter_comments_since."""
+        try:
+            window = self._recent_comments()
+        except PRAWException as e:
+            print(f"Error fetching comments from Reddit: {e}")
+            return
+        except Exception as e:
+            print(f"Unexpected error: {e}")
+            return
 
-                # Skip comments older than our last check
-                if timestamp and comment_timestamp <= timestamp:
-                    continue
+        # Only look at the most recent few comments on the first run
+        limit = 100 if timestamp else 10
 
-                # Skip deleted/removed comments
-                if comment.author is None:
-                    continue
+        for comment in islice(window, max(len(window) - limit, 0), None):
+            # Skip comments older than our last check
+            if timestamp and comment['ts'] <= timestamp:
+                continue
+            if self.newest_comment_ts is None or comment['ts'] > self.newest_comment_ts:
+                self.newest_comment_ts = comment['ts']
+            yield comment
 
-                # Build comment data
-                comment_data = {
-                    'text': comment.body,
-                    'author': str(comment.author),
-                    'ts': comment_timestamp,
-                    'score': comment.score,
-                    'permalink': f"https://www.reddit.com{comment.permalink}",
-                    'post_title': comment.submission.title if hasattr(comment, 'submission') else '',
-                    'post_url': f"https://www.reddit.com{comment.submission.permalink}" if hasattr(comment, 'submission') else '',
-                }
+    def get_comments_since(self, timestamp: Optional[float] = None,
+                           sort: bool = True) -> Tuple[List[Dict], Optional[float]]:
+        """Fetch comments from the subreddit since a given timestamp.
 
-                comments.append(comment_data)
+        Args:
+            timestamp: Unix timestamp to fetch comments after. If None, fetches recent comments.
+            sort: Sort the comments by timestamp (oldest first)
 
-            # Sort by timestamp (oldest first)
+        Returns:
+            Tuple of (comment dictionaries, timestamp of the newest one or None
+            if there are none)
+        """
+        comments = list(self.iter_comments_since(timestamp))
+        if sort:
             comments.sort(key=lambda x: x['ts'])
-
-            return comments
-
-        except PRAWException as e:
-            print(f"Error fetching comments from Reddit: {e}")
-            return []
-        except Exception as e:
-            print(f"Unexpected error: {e}")
-            return []
+        return comments, self.newest_comment_ts
 
     def test_connection(self) -> bool:
         """Test if the Reddit connection is working.
@@ -148,7 +322,8 @@ class RedditMonitor:
         """
         try:
             # Try to access the subreddit
-            _ = self.subreddit.display_name
+            with _reddit_lock:
+                _ = self.subreddit.display_name
             return True
         except PRAWException as e:
             print(f"Connection test failed: {e}")
@@ -1,12 +1,38 @@
 """State management for tracking last check timestamp."""
 import os
 import json
-from typing import Optional, Dict
+import mmap
+import logging
+import time
+import tempfile
+import threading
+from typing import Optional, Dict, List, Sequence
+
+try:
+    import orjson
+except ImportError:  # optional: pip install orjson
+    orjson = None
+
+log = logging.getLogger(__name__)
+
+# Flushes file data without the metadata (mtime) that isn't needed to read it
+# back; not available on Windows and macOS, where fsync is used instead
+_fdatasync = getattr(os, 'fdatasync', os.fsync)
+
+# The process umask, read once at import (os.umask can only be read by setting it)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
 
 
 class StateManager:
     """Manage persistent state for the monitor."""
 
+    __slots__ = ('state_file', '_state_cache', '_lock', '_dirty', '_last_flush')
+
+    # Minimum number of seconds between two writes of the state file; updates
+    # made in between are kept in memory and written by the next flush.
+    FLUSH_INTERVAL = 2.0
+
     def __init__(self, state_file: str = "last_check.json"):
         """Initialize state manager.
 
@@ -14,7 +40,29 @@ class StateManager:
             state_file: Path to the state file (JSON format)
         """
         self.state_file = state_file
-        self._state = self._load_state()
+        # Read from the state file on first use, see _state
+        self._state_cache = None
+        # Monitor threads share one manager. Updates, flushes and the lazy
+        # load go through this lock; reads are single dict lookups and don't.
+        self._lock = threading.RLock()
+        self._dirty = False
+        self._last_flush = 0.0
+
+    @property
+    def _state(self) -> Dict[str, float]:
+        """The state dictionary, loaded from the state file on first access."""
+        state = self._state_cache
+        if state is None:
+            # Monitor threads may ask for it at the same time; load it once
+            with self._lock:
+                if self._state_cache is None:
+                    self._state_cache = self._load_state()
+                state = self._state_cache
+        return state
+
+    @_state.setter
+    def _state(self, value: Dict[str, float]):
+        self._state_cache = value
 
     def _load_state(self) -> Dict[str, float]:
         """Load state from file.
@@ -22,14 +70,26 @@ class StateManager:
         Returns:
             Dictionary mapping subreddit names to timestamps
         """
-        if not os.path.exists(self.state_file):
-            return {}
-
         try:
-            with open(self.state_file, 'r') as f:
-                return json.load(f)
+            # A raw descriptor: no buffered reader, one fstat and one read
+            fd = os.open(self.state_file, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+            try:
+                size = os.fstat(fd).st_size
+                if orjson is not None and size >= mmap.PAGESIZE:
+                    # Parse straight from the page cache instead of copying the
+                    # file into a bytes object first; not worth it for files
+                    # smaller than a page
+                    with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+                        with memoryview(mm) as view:
+                            return orjson.loads(view)
+                data = self._read_all(fd, size)
+            finally:
+                os.close(fd)
+            return orjson.loads(data) if orjson is not None else json.loads(data)
+        except FileNotFoundError:
+            return {}
         except (ValueError, IOError, json.JSONDecodeError) as e:
-            print(f"Error reading state file: {e}")
+            log.error("Error reading state file: %s", e)
             return {}
 
     def _save_state(self) -> bool:
@@ -38,14 +98,95 @@ class StateManager:
         Returns:
             True if successful, False otherwise
         """
+        # Written compactly; use dump_pretty() to read it
+        if orjson is not None:
+            payload = orjson.dumps(self._state)
+        else:
+            payload = json.dumps(self._state, separators=(',', ':')).encode('utf-8')
+
+        # Write a temporary file next to the state file and rename it over
+        # the old one, so a crash mid-write can't leave a truncated file
+        directory = os.path.dirname(self.state_file) or '.'
+        tmp_path = None
         try:
-            with open(self.state_file, 'w') as f:
-                json.dump(self._state, f, indent=2)
-            return True
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            try:
+                # mkstemp creates the file as 0600; give it the mode of the file
+                # it replaces (or the umask default) so saving doesn't change it
+                if hasattr(os, 'fchmod'):
+                    os.fchmod(fd, self._file_mode())
+                self._write_all(fd, payload)
+                _fdatasync(fd)
+            finally:
+                os.close(fd)
+            os.replace(tmp_path, self.state_file)
         except IOError as e:
-            print(f"Error writing state file: {e}")
+            log.error("Error writing state file: %s", e)
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
             return False
 
+        self._sync_directory(directory)
+        return True
+
+    def _file_mode(self) -> int:
+        """Permission bits for a new state file: the current file's, if any."""
+        try:
+            return os.stat(self.state_file).st_mode & 0o777
+        except FileNotFoundError:
+            return 0o666 & ~_UMASK
+
+    @staticmethod
+    def _read_all(fd: int, size: int) -> bytes:
+        """Read size bytes from a raw file descriptor.
+
+        Normally a single os.read; keeps reading if it comes back short, and
+        stops early if the file turns out to be shorter than size.
+        """
+        data = os.read(fd, size)
+        if len(data) == size:
+            return data
+        chunks = [data]
+        received = len(data)
+        while received < size:
+            chunk = os.read(fd, size - received)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            received += len(chunk)
+        return b''.join(chunks)
+
+    @staticmethod
+    def _write_all(fd: int, data: bytes):
+        """Write all of data to a raw file descriptor.
+
+        os.write may write fewer bytes than requested, so keep writing the
+        remainder without copying it.
+        """
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+
+    @staticmethod
+    def _sync_directory(directory: str):
+        """Flush a directory entry to disk so a rename into it is durable.
+
+        Only possible on POSIX; elsewhere (and on filesystems that refuse to
+        sync directories) this does nothing.
+        """
+        if os.name != 'posix':
+            return
+        try:
+            fd = os.open(directory, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
     def get_last_check(self, subreddit: str) -> Optional[float]:
         """Get the timestamp of the last check for a specific subreddit.
 
@@ -57,6 +198,19 @@ class StateManager:
         """
         return self._state.get(subreddit)
 
+    def get_last_checks(self, subreddits: Sequence[str]) -> List[Optional[float]]:
+        """Get the timestamps of the last checks for several subreddits at once.
+
+        Args:
+            subreddits: Names of the subreddits
+
+        Returns:
+            Unix timestamps of the last checks in the same order, with None
+            for subreddits that have no previous check
+        """
+        state = self._state
+        return [state.get(subreddit) for subreddit in subreddits]
+
     def save_last_check(self, subreddit: str, timestamp: float) -> bool:
         """Save the timestamp of the last check for a specific subreddit.
 
@@ -67,8 +221,45 @@ class StateManager:
         Returns:
             True if successful, False otherwise
         """
-        self._state[subreddit] = timestamp
-        return self._save_state()
+        with self._lock:
+            previous = self._state.get(subreddit)
+            if previous is not None and abs(previous - timestamp) < 1e-6:
+                # Nothing changed, so there is nothing to write
+                return True
+
+            self._state[subreddit] = timestamp
+            self._dirty = True
+            if time.monotonic() - self._last_flush > self.FLUSH_INTERVAL:
+                return self.flush()
+            return True
+
+    def flush(self) -> bool:
+        """Write pending state changes to the state file.
+
+        save_last_check writes at most once per FLUSH_INTERVAL, so call this
+        at the end of a monitoring cycle and before exiting to persist the
+        remaining updates.
+
+        Returns:
+            True if successful or there was nothing to write, False otherwise
+        """
+        with self._lock:
+            if not self._dirty:
+                return True
+            self._last_flush = time.monotonic()
+            if not self._save_state():
+                return False
+            self._dirty = False
+            return True
+
+    def dump_pretty(self) -> str:
+        """Format the current state as indented JSON for debugging.
+
+        Returns:
+            The state as a JSON string with keys sorted and two-space indentation
+        """
+        with self._lock:
+            return json.dumps(self._state, indent=2, sort_keys=True)
 
     def reset(self, subreddit: Optional[str] = None) -> bool:
         """Reset the state for a specific subreddit or all subreddits.
@@ -79,19 +270,23 @@ class StateManager:
         Returns:
             True if successful, False otherwise
         """
-        try:
-            if subreddit:
-                # Reset specific subreddit
-                if subreddit in self._state:
-                    del self._state[subreddit]
-                    return self._save_state()
-                return True
-            else:
-                # Reset all - delete the file
-                if os.path.exists(self.state_file):
-                    os.remove(self.state_file)
-                self._state = {}
-                return True
-        except IOError as e:
-            print(f"Error resetting state: {e}")
-            return False
+        with self._lock:
+            try:
+                if subreddit:
+                    # Reset specific subreddit
+                    if self._state.pop(subreddit, None) is not None:
+                        self._dirty = True
+                        return self.flush()
+                    return True
+                else:
+                    # Reset all - delete the file
+                    try:
+                        os.remove(self.state_file)
+                    except FileNotFoundError:
+                        pass
+                    self._state = {}
+                    self._dirty = False
+                    return True
+            except IOError as e:
+                log.error("Error resetting state: %s", e)
+                return False